@@ -0,0 +1,120 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from app import app
+from chat import load_articles, load_embeddings
+
+
+class Corpus(object):
+    """
+    A loaded corpus: the article sections DataFrame and its embeddings dictionary,
+    along with the bookkeeping used for logging and eviction.
+    """
+    def __init__(self, name, df, document_embeddings, load_time):
+        self.name = name
+        self.df = df
+        self.document_embeddings = document_embeddings
+        self.load_time = load_time
+        self.size = estimate_size(df, document_embeddings)
+        self.hits = 0
+
+
+def estimate_size(df, document_embeddings):
+    """
+    Approximate the resident size in bytes of a corpus.
+    Embedding vectors are lists of Python floats, so each value is counted individually.
+    """
+    size = int(df.memory_usage(index=True, deep=True).sum())
+    size += sys.getsizeof(document_embeddings)
+    for vector in document_embeddings.values():
+        size += sys.getsizeof(vector) + len(vector) * sys.getsizeof(0.0)
+    return size
+
+
+class CorpusCache(object):
+    """
+    Lazily loads named corpora from app.config['CORPORA'] and keeps the most recently
+    used ones in memory. When the total resident size exceeds the memory budget, the
+    least recently used corpora are evicted until it fits again. The corpus that was
+    just requested is never evicted, even if it alone is over budget.
+
+    Corpora are unpickled outside the shared lock, so requests for corpora that are
+    already loaded are not held up while another one loads. A per-name lock makes
+    sure each corpus is only loaded once when several requests ask for it together.
+    """
+    def __init__(self, corpora, memory_budget_mb):
+        self.corpora = corpora
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.loaded = OrderedDict()
+        self.lock = threading.Lock()
+        self.load_locks = {}
+
+    def __contains__(self, name):
+        return name in self.corpora
+
+    def get(self, name):
+        """
+        Return the Corpus for the given name, loading it on first use.
+        Raises KeyError if the name is not a configured corpus.
+        """
+        if name not in self.corpora:
+            raise KeyError(name)
+
+        with self.lock:
+            corpus = self._hit(name)
+            if corpus is not None:
+                return corpus
+            load_lock = self.load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            # Another request may have loaded it while this one was waiting
+            with self.lock:
+                corpus = self._hit(name)
+                if corpus is not None:
+                    return corpus
+
+            corpus = self._load(name)
+
+            with self.lock:
+                self.loaded[name] = corpus
+                self._evict()
+                return self._hit(name)
+
+    def _hit(self, name):
+        # Must be called with self.lock held
+        corpus = self.loaded.get(name)
+        if corpus is not None:
+            self.loaded.move_to_end(name)
+            corpus.hits += 1
+            app.logger.debug(f"Corpus '{name}' hit #{corpus.hits}")
+        return corpus
+
+    def resident_size(self):
+        return sum(corpus.size for corpus in self.loaded.values())
+
+    def _load(self, name):
+        paths = self.corpora[name]
+        start_time = time.perf_counter()
+        df = load_articles(paths['articles'])
+        document_embeddings = load_embeddings(paths['embeddings'])
+        elapsed = time.perf_counter() - start_time
+
+        corpus = Corpus(name, df, document_embeddings, elapsed)
+        app.logger.info(
+            f"📚 Loaded corpus '{name}' in {elapsed:.3f} seconds "
+            f"({corpus.size / (1024 * 1024):.1f} MB resident)"
+        )
+        return corpus
+
+    def _evict(self):
+        # Drop least recently used corpora, but always keep the newest one
+        while len(self.loaded) > 1 and self.resident_size() > self.memory_budget:
+            name, corpus = self.loaded.popitem(last=False)
+            app.logger.info(
+                f"🗑️ Evicted corpus '{name}' after {corpus.hits} hits "
+                f"({corpus.size / (1024 * 1024):.1f} MB freed)"
+            )
+
+
+corpus_cache = CorpusCache(app.config['CORPORA'], app.config['CORPUS_MEMORY_BUDGET_MB'])
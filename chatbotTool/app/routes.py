@@ -1,26 +1,44 @@
 from app import app
-from flask import render_template, flash, redirect, session, url_for, request, Response
+from flask import render_template, flash, redirect, session, url_for, request, Response, abort
 from app.forms import ChatForm, PasswordForm
-from chat import setupChat, answer_query_with_context
+from app.corpora import corpus_cache
+from chat import answer_query_with_context
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 from collections import deque
-import pickle
 import os
 
-# Embeddings will be initialized after login
-document_embeddings = None
-df = None
+def reset_chat_state():
+    """
+    Clear all session-based chat state.
+    """
+    session["chatHistory"] = []
+    session["previousChat"] = []
+    session["previousChatNew"] = []
+    session["justQuestions"] = []
+    session["fullChat"] = []
+
+def select_corpus(corpus):
+    """
+    Resolve the corpus for this request. A corpus named in the URL is remembered in
+    the session; otherwise the session's corpus (or the configured default) is used.
+    Switching corpora resets the chat, since earlier answers came from other sources.
+    A session corpus that is no longer configured falls back to the default.
+    """
+    current = session.get('corpus')
+    if current not in corpus_cache:
+        current = app.config['DEFAULT_CORPUS']
+
+    if corpus is None:
+        corpus = current
+    elif corpus not in corpus_cache:
+        abort(404)
 
-def ensure_loaded():
-    global document_embeddings, df
-    if document_embeddings is None:
-        document_embeddings = setupChat()
-    if df is None:
-        with open(app.config['ARTICLES_FILE'], "rb") as f:
-            f.seek(0)
-            loaded_df = pickle.load(f)
-            df = loaded_df.set_index(["uniqueId"])
+    if session.get('corpus', app.config['DEFAULT_CORPUS']) != corpus:
+        reset_chat_state()
+    session['corpus'] = corpus
+
+    return corpus_cache.get(corpus)
 
 @app.before_request
 def check_session():
@@ -44,10 +62,8 @@ def home():
 def password():
     """
     Password gate to access the chatbot.
-    Loads embeddings and initializes session state upon successful login.
+    Initializes session state upon successful login. Corpora are loaded on first use.
     """
-    global document_embeddings  # Access the shared variable to store embeddings
-
     form = PasswordForm()
 
     if request.method == 'POST' and form.validate_on_submit():
@@ -57,7 +73,6 @@ def password():
         if password == os.getenv("CHAT_PASSWORD"):
             session.clear() 
             session['logged_in'] = True
-            document_embeddings = setupChat()
             session['fullChat'] = [] 
 
             return redirect(url_for('chatRoute'))
@@ -67,20 +82,21 @@ def password():
     return render_template('index.html', form=form)
 
 @app.route('/chat', methods=['GET', 'POST'])
-def chatRoute():
+@app.route('/chat/<corpus>', methods=['GET', 'POST'])
+def chatRoute(corpus=None):
     """
     The main chat route, which handles conversation flow and response rendering.
     Manages session-based chat history and query-response threading.
+    An optional corpus name in the URL selects which article corpus answers come from.
     """
-
-    ensure_loaded()
-
     context = "No Context Yet"
     prompt = "No prompt Yet"
     uniqueLinks = []
     followupSuggestions = []
 
     if session.get('logged_in'):
+        activeCorpus = select_corpus(corpus)
+
         # Retrieve session-persistent chat state
         chatHistory = session.get('chatHistory', [])
         previousChat = session.get('previousChat', [])
@@ -92,11 +108,7 @@ def chatRoute():
 
         if form.reset.data:
             # Reset all session-based chat states when Reset is clicked
-            session["chatHistory"] = []
-            session["previousChat"] = []
-            session["previousChatNew"] = []
-            session["justQuestions"] = []
-            session["fullChat"] = [] 
+            reset_chat_state()
 
             # Clear local copies too
             chatHistory = []
@@ -104,7 +116,7 @@ def chatRoute():
             previousChatNew = []
             justQuestions = []
 
-            return redirect(url_for('chatRoute'))
+            return redirect(url_for('chatRoute', corpus=activeCorpus.name))
 
         if request.method == 'POST' and form.export.data:
             export_text = "\n".join(fullChat)
@@ -122,7 +134,7 @@ def chatRoute():
 
             # Get AI-generated answer and sources using contextual retrieval
             answer, answerWithSource, context, prompt, uniqueLinks = answer_query_with_context(
-                list(previousChat), list(previousChatNew), question, justQuestions, df, document_embeddings
+                list(previousChat), list(previousChatNew), question, justQuestions, activeCorpus.df, activeCorpus.document_embeddings
             )
 
             answerDisplay = "\n" + answerWithSource + "\n"
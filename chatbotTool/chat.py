@@ -29,14 +29,23 @@ def get_embedding(text, model: str = EMBEDDING_MODEL):
     )
     return result.data[0].embedding
 
-def load_embeddings(fname):
+def read_table(fname):
     """
-    Load a pickled DataFrame containing document embeddings and return as a dictionary.
-    Assumes the DataFrame contains a 'uniqueId' index and numerical columns for the embedding.
+    Read a DataFrame from a pickle file, or from a CSV file as written by genericPipeline.py.
     """
+    if fname.endswith(".csv"):
+        return pd.read_csv(fname)
+
     with open(fname, "rb") as f:
         f.seek(0)
-        df = pickle.load(f)
+        return pickle.load(f)
+
+def load_embeddings(fname):
+    """
+    Load a DataFrame containing document embeddings and return as a dictionary.
+    Assumes the DataFrame contains a 'uniqueId' index and numerical columns for the embedding.
+    """
+    df = read_table(fname)
 
     # Remove extra columns that are not needed for similarity calculations
     df = df.drop('title', axis=1)
@@ -51,24 +60,16 @@ def load_embeddings(fname):
 
     return embeddings_dict
 
-@benchmark("setupChat")
-def setupChat():
+def load_articles(fname):
     """
-    Load the article content and associated document embeddings.
-    Returns the embeddings dictionary used to find relevant sections.
+    Load a DataFrame of article sections, indexed by 'uniqueId' for lookups.
     """
-    # Load articles from a pickle file
-    with open(app.config['ARTICLES_FILE'], "rb") as f:
-        f.seek(0)
-        df = pickle.load(f)
+    df = read_table(fname)
 
     # Ensure DataFrame is indexed properly for lookups
     df.set_index(["uniqueId"], inplace=True)
 
-    # Load corresponding document embeddings
-    document_embeddings = load_embeddings(app.config['EMBEDDINGS_FILE'])
-
-    return document_embeddings
+    return df
 
 def vector_similarity(x, y):
     """
@@ -11,6 +11,16 @@ class Config(object):
     ARTICLES_FILE = "static/articles.pkl"
     EMBEDDINGS_FILE = "static/embeddings.pkl"
 
+    # Corpus settings
+    # Each named corpus points at its own articles and embeddings pickles.
+    # Corpora are loaded on first use and idle ones are evicted once the
+    # total resident size goes over CORPUS_MEMORY_BUDGET_MB.
+    DEFAULT_CORPUS = "default"
+    CORPORA = {
+        DEFAULT_CORPUS: {"articles": ARTICLES_FILE, "embeddings": EMBEDDINGS_FILE},
+    }
+    CORPUS_MEMORY_BUDGET_MB = int(os.environ.get('CORPUS_MEMORY_BUDGET_MB') or 1024)
+
     # Prompt settings
     MAX_SECTION_LEN = 500
     SEPARATOR = "\n* "
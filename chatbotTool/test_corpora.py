@@ -0,0 +1,92 @@
+import sys
+import threading
+import time
+import types
+import pytest
+
+MB = 1024 * 1024
+
+@pytest.fixture
+def corpora(monkeypatch, tmp_path):
+    """
+    Import app.corpora with the chat module stubbed out, so no OpenAI client or tokenizer
+    is created. Corpus loading is replaced in each test. The app writes its log and session
+    files to the working directory, so the import runs from a temporary one.
+    """
+    pytest.importorskip("flask")
+    pytest.importorskip("flask_session")
+    pytest.importorskip("flask_wtf")
+
+    chat = types.ModuleType("chat")
+    chat.load_articles = chat.load_embeddings = chat.answer_query_with_context = None
+    monkeypatch.setitem(sys.modules, "chat", chat)
+    monkeypatch.chdir(tmp_path)
+
+    from app import corpora
+    yield corpora
+
+    # Drop the app modules so nothing else sees them bound to the stubbed chat module
+    for name in [name for name in sys.modules if name in ("app", "config") or name.startswith("app.")]:
+        del sys.modules[name]
+
+@pytest.fixture
+def loads(corpora, monkeypatch):
+    """
+    Record every corpus load. Each corpus is 1 MB, except ones named 'big' which are 3 MB.
+    """
+    loads = []
+
+    def load_articles(fname):
+        loads.append(fname)
+        time.sleep(0.05)
+        return fname
+
+    monkeypatch.setattr(corpora, "load_articles", load_articles)
+    monkeypatch.setattr(corpora, "load_embeddings", lambda fname: {})
+    monkeypatch.setattr(corpora, "estimate_size", lambda df, embeddings: 3 * MB if df == "big" else MB)
+    return loads
+
+def makeCache(corpora, names, budget_mb):
+    return corpora.CorpusCache({name: {"articles": name, "embeddings": name} for name in names}, budget_mb)
+
+def test_least_recently_used_corpus_is_evicted(corpora, loads):
+    cache = makeCache(corpora, ["a", "b", "c"], 2)
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")
+
+    assert list(cache.loaded) == ["a", "c"]
+    assert cache.loaded["a"].hits == 2
+    assert cache.loaded["c"].hits == 1
+
+    # b was evicted, so it is loaded again
+    cache.get("b")
+    assert loads == ["a", "b", "c", "b"]
+    assert list(cache.loaded) == ["c", "b"]
+
+def test_requested_corpus_is_kept_when_over_budget(corpora, loads):
+    cache = makeCache(corpora, ["a", "big"], 2)
+    cache.get("a")
+    corpus = cache.get("big")
+
+    assert corpus.name == "big"
+    assert list(cache.loaded) == ["big"]
+
+def test_corpus_is_loaded_once_by_concurrent_requests(corpora, loads):
+    cache = makeCache(corpora, ["a", "b"], 2)
+    cache.get("b")
+    threads = [threading.Thread(target=cache.get, args=("a",)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ["b", "a"]
+    assert cache.loaded["a"].hits == 5
+
+def test_unknown_corpus_raises(corpora, loads):
+    cache = makeCache(corpora, ["a"], 2)
+    assert "missing" not in cache
+    with pytest.raises(KeyError):
+        cache.get("missing")
@@ -0,0 +1,93 @@
+import hashlib
+import importlib
+import sys
+import threading
+import types
+from http.server import HTTPServer, BaseHTTPRequestHandler
+import pytest
+
+PREP_SCRIPTS = ("genericDataGather", "genericEmbedding", "genericPipeline", "pageCache")
+
+@pytest.fixture
+def importWithStubs(monkeypatch):
+    """
+    Returns a function that imports a prep script with the given modules replaced by stubs,
+    e.g. importWithStubs("genericPipeline", {"openai": {"OpenAI": ...}}). The stubs are only
+    in place for the test, and the prep scripts are imported afresh each time so none of
+    them stays bound to a stub afterwards.
+    """
+    def importer(name, stubs):
+        for moduleName, attrs in stubs.items():
+            module = types.ModuleType(moduleName)
+            module.__dict__.update(attrs)
+            monkeypatch.setitem(sys.modules, moduleName, module)
+        for script in PREP_SCRIPTS:
+            monkeypatch.delitem(sys.modules, script, raising=False)
+        return importlib.import_module(name)
+
+    yield importer
+
+    for script in PREP_SCRIPTS:
+        sys.modules.pop(script, None)
+
+class FakeTokenizer:
+    """
+    Stands in for GPT2TokenizerFast, treating each word as a token.
+    """
+    @classmethod
+    def from_pretrained(cls, name):
+        return cls()
+
+    def encode(self, text):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+class ArticleServer(BaseHTTPRequestHandler):
+    """
+    Serves the server's `pages`. Paths starting with /etag/ answer If-None-Match with
+    304 Not Modified; other paths send no validators and always return the full page.
+    Every request is recorded in the server's `requests` as (path, If-None-Match).
+    """
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path not in self.server.pages:
+            self.send_error(404)
+            return
+
+        body = self.server.pages[self.path].encode("utf-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        validators = self.path.startswith("/etag/")
+        if validators and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        if validators:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    """
+    A local HTTP server that honors conditional request headers, with two pages to start.
+    """
+    httpd = HTTPServer(("127.0.0.1", 0), ArticleServer)
+    httpd.pages = {"/etag/a": "<html>A1</html>", "/plain/b": "<html>B1</html>"}
+    httpd.requests = []
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
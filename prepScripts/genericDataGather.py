@@ -2,21 +2,40 @@ import pandas as pd
 import argparse
 from newspaper import Article
 from transformers import GPT2TokenizerFast
+from pageCache import PageCache
+import http.client
+import hashlib
 import time
 
 # Load the GPT2 tokenizer to count tokens in text (used later to limit or filter text length)
 tokenizer = GPT2TokenizerFast.from_pretrained('gpt2')
 
-def scrapeArticleText(links):
+def scrapeArticleText(links, cache=None):
     """
     Given a list of article URLs, this function downloads and parses each article,
     extracting the title and full text, then returns a DataFrame with the results.
+    If a PageCache is given, pages are fetched conditionally and only articles that
+    are new or have changed since the last run are parsed and returned. Pages that
+    fail to download are skipped, and the cache index is saved every 50 pages.
     """
-    articleDf = pd.DataFrame(columns=["title", "articleText"])
+    articleDf = pd.DataFrame(columns=["title", "articleText", "articleLink"])
 
-    for link in links:
+    for i, link in enumerate(links, 1):
         article = Article(link)
-        article.download()  # Fetch the article HTML
+        if cache is None:
+            article.download()  # Fetch the article HTML
+        else:
+            try:
+                html = cache.fetch(link)
+            except (OSError, http.client.HTTPException) as e:
+                print(f"Skipping {link}: {e}")
+                continue
+            finally:
+                if i % 50 == 0:
+                    cache.save()
+            if html is None:
+                continue    # Unchanged since the last run, nothing to re-process
+            article.download(input_html=html)
         article.parse()     # Extract and structure the article content
 
         rowDict = {
@@ -59,6 +78,14 @@ def splitByParagraph(articlesDf):
 
     return articlesDf
 
+def stableIds(articlesDf):
+    """
+    Builds IDs from a hash of each paragraph's article link and its position within
+    that article, so an article's paragraphs get the same IDs on every run.
+    """
+    linkIds = articlesDf['articleLink'].apply(lambda link: hashlib.sha1(link.encode('utf-8')).hexdigest()[:12])
+    return linkIds + '-' + articlesDf.groupby('articleLink').cumcount().astype(str)
+
 def count_tokens(text):
     """
     Returns the number of tokens in a given text using the GPT2 tokenizer.
@@ -82,21 +109,45 @@ def main():
     parser = argparse.ArgumentParser(description='Scrape articles and split into paragraphs.')
     parser.add_argument('-i', '--input', required=True, help='Input CSV file with article links')
     parser.add_argument('-o', '--output', required=True, help='Output CSV file for split paragraphs')
+    parser.add_argument('-c', '--cache', help='Directory for the raw page cache; only new or changed articles are output')
     args = parser.parse_args()
 
     # Read the list of article links from the input file (assumes no header row)
     df = pd.read_csv(args.input, header=None)
     linkList = df[0].tolist()
 
+    # With a cache, IDs depend on each paragraph's position in its article, so each link is scraped once
+    if args.cache:
+        linkList = list(dict.fromkeys(linkList))
+
     # Scrape and process articles 
-    allArticles = scrapeArticleText(linkList)
-    
-    # Split article text into individual paragraphs and process
-    articlesSplitByParagraphDf = splitByParagraph(allArticles)
-
-    # Set the row index as a unique ID and save the result to a CSV file
-    articlesSplitByParagraphDf.index.name = 'uniqueId'
-    articlesSplitByParagraphDf.to_csv(args.output)
+    cache = PageCache(args.cache) if args.cache else None
+    try:
+        allArticles = scrapeArticleText(linkList, cache)
+        if cache is not None:
+            print(f"{len(allArticles)} of {len(linkList)} articles are new or changed")
+
+        # Split article text into individual paragraphs and process
+        if allArticles.empty:
+            # Still write the (empty) output, so a previous run's changes are not picked up again
+            articlesSplitByParagraphDf = pd.DataFrame(columns=["title", "articleText", "articleLink", "numTokens"])
+        else:
+            articlesSplitByParagraphDf = splitByParagraph(allArticles)
+
+        # With a cache, IDs are based on the article link so changed articles can replace their old rows
+        if cache is not None:
+            articlesSplitByParagraphDf.index = stableIds(articlesSplitByParagraphDf)
+
+        # Set the row index as a unique ID and save the result to a CSV file
+        articlesSplitByParagraphDf.index.name = 'uniqueId'
+        articlesSplitByParagraphDf.to_csv(args.output)
+
+        # Only once the output is written do these articles count as unchanged
+        if cache is not None:
+            cache.commit(allArticles['articleLink'])
+    finally:
+        if cache is not None:
+            cache.save()
 
     # End timer and print runtime
     end_time = time.time()
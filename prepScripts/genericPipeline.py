@@ -0,0 +1,296 @@
+import argparse
+import csv
+import os
+import queue
+import threading
+import time
+from newspaper import Article
+from newspaper.article import ArticleException
+from genericDataGather import count_tokens, reduceLong
+from genericEmbedding import get_embedding
+
+# Marks the end of a stage's output on its queue
+SENTINEL = object()
+
+class PipelineStopped(Exception):
+    """
+    Raised inside a stage when another stage has failed and the pipeline is shutting down.
+    """
+    pass
+
+class StageStats:
+    """
+    Tracks how many items a stage produced, how long it ran and how much of that time it
+    spent busy, for throughput reporting. Busy time is the time spent producing items,
+    not waiting on a queue, summed over the stage's workers. The rate per busy second
+    shows which stage is the bottleneck even once the queues between stages are full.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.start_time = None
+        self.elapsed = 0.0
+        self.busy = 0.0
+
+    def report(self):
+        rate = self.items / self.busy if self.busy else 0.0
+        return (f"{self.name:>8}: {self.items} items in {self.busy:.2f} busy seconds "
+                f"({rate:.2f} items/busy second), {self.elapsed:.2f} seconds wall time")
+
+def readLinks(path):
+    """
+    Yield article links one at a time from a file with one URL per line (no header row).
+    """
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if row and row[0].strip():
+                yield row[0].strip()
+
+def scrapeStage(links):
+    """
+    Download and parse each article, yielding its title, text and link.
+    Articles that fail to download are skipped so one bad URL does not stop the run.
+    """
+    for link in links:
+        article = Article(link)
+        try:
+            article.download()  # Fetch the article HTML
+            article.parse()     # Extract and structure the article content
+        except ArticleException as e:
+            print(f"Skipping {link}: {e}")
+            continue
+
+        yield {"title": article.title, "articleText": article.text, "articleLink": link}
+
+def splitStage(articles):
+    """
+    Split each article into paragraphs by newline, dropping empty ones.
+    """
+    for article in articles:
+        for paragraph in article["articleText"].split("\n"):
+            if paragraph.strip() != "":
+                yield dict(article, articleText=paragraph)
+
+def tokenizeStage(paragraphs):
+    """
+    Count tokens in each paragraph, truncate long ones to 500 tokens and drop very short ones.
+    Surviving paragraphs are numbered in order to give each a uniqueId.
+    """
+    uniqueId = 0
+    for paragraph in paragraphs:
+        numTokens = count_tokens(paragraph["articleText"])
+
+        # Remove very short paragraphs (fewer than 5 tokens)
+        if numTokens < 5:
+            continue
+
+        # Truncate paragraphs longer than 500 tokens
+        if numTokens > 500:
+            paragraph["articleText"] = reduceLong(paragraph["articleText"])
+
+        paragraph["uniqueId"] = uniqueId
+        paragraph["numTokens"] = numTokens
+        uniqueId += 1
+        yield paragraph
+
+def embedStage(paragraphs):
+    """
+    Attach an embedding vector to each paragraph.
+    """
+    for paragraph in paragraphs:
+        paragraph["embedding"] = get_embedding(paragraph["articleText"])
+        yield paragraph
+
+def writeStage(paragraphs, articles_csv, embeddings_csv):
+    """
+    Append each paragraph to the articles CSV and its embedding to the embeddings CSV
+    as it arrives, so neither file is ever held in memory as a whole.
+    """
+    with open(articles_csv, "w", newline="") as articlesFile, open(embeddings_csv, "w", newline="") as embeddingsFile:
+        articlesWriter = csv.writer(articlesFile)
+        embeddingsWriter = csv.writer(embeddingsFile)
+        articlesWriter.writerow(["uniqueId", "title", "articleText", "articleLink", "numTokens"])
+        embeddingsHeader = False
+
+        for paragraph in paragraphs:
+            embedding = paragraph["embedding"]
+
+            # The number of embedding dimensions is only known once the first row arrives
+            if not embeddingsHeader:
+                embeddingsWriter.writerow(["uniqueId", "title", "articleLink"] + list(range(len(embedding))))
+                embeddingsHeader = True
+
+            articlesWriter.writerow([paragraph["uniqueId"], paragraph["title"], paragraph["articleText"],
+                                     paragraph["articleLink"], paragraph["numTokens"]])
+            embeddingsWriter.writerow([paragraph["uniqueId"], paragraph["title"], paragraph["articleLink"]] + embedding)
+            yield paragraph["uniqueId"]
+
+def iterQueue(inQueue, stopEvent):
+    """
+    Yield items from a stage's input queue until the upstream stage signals it is done.
+    The end marker is put back so any sibling workers reading the same queue also stop.
+    Stops as soon as the pipeline is shutting down, without reading another item.
+    """
+    while True:
+        if stopEvent.is_set():
+            raise PipelineStopped()
+        try:
+            item = inQueue.get(timeout=0.5)
+        except queue.Empty:
+            continue
+
+        if item is SENTINEL:
+            inQueue.put(SENTINEL)
+            return
+        yield item
+
+def putQueue(outQueue, item, stopEvent):
+    """
+    Put an item on a bounded queue, giving up if the pipeline is shutting down.
+    """
+    while True:
+        if stopEvent.is_set():
+            raise PipelineStopped()
+        try:
+            outQueue.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+
+def startStage(stats, func, source, outQueue, stopEvent, errors, workers=1):
+    """
+    Run a generator stage in one or more threads, feeding its output into outQueue.
+    The source is an iterable, or a callable returning one so each worker gets its own iterator.
+    A stage with no outQueue is the final one and only counts what it produced.
+    Returns the started threads.
+    """
+    lock = threading.Lock()
+    remaining = [workers]
+    stats.start_time = time.perf_counter()
+
+    def worker():
+        waited = [0.0]
+
+        def timedSource(items):
+            # Time spent waiting on the input queue does not count as busy
+            items = iter(items)
+            while True:
+                start = time.perf_counter()
+                item = next(items, SENTINEL)
+                waited[0] += time.perf_counter() - start
+                if item is SENTINEL:
+                    return
+                yield item
+
+        def timedOutput(items):
+            outputs = func(items)
+            while True:
+                start = time.perf_counter()
+                waitedBefore = waited[0]
+                item = next(outputs, SENTINEL)
+                busy = time.perf_counter() - start - (waited[0] - waitedBefore)
+                with lock:
+                    stats.busy += busy
+                if item is SENTINEL:
+                    return
+                yield item
+
+        try:
+            # Queue-fed stages get a callable source; the first stage reads its input directly
+            items = timedSource(source()) if callable(source) else source
+            for item in timedOutput(items):
+                if outQueue is not None:
+                    putQueue(outQueue, item, stopEvent)
+                with lock:
+                    stats.items += 1
+        except PipelineStopped:
+            pass
+        except Exception as e:
+            errors.append((stats.name, e))
+            stopEvent.set()
+        finally:
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            # The last worker to finish closes the stage
+            if last:
+                stats.elapsed = time.perf_counter() - stats.start_time
+                if outQueue is not None:
+                    try:
+                        putQueue(outQueue, SENTINEL, stopEvent)
+                    except PipelineStopped:
+                        pass
+
+    threads = [threading.Thread(target=worker, name=f"{stats.name}-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+def runPipeline(links, articles_csv, embeddings_csv, queue_size=100, scrape_workers=1, embed_workers=4):
+    """
+    Chain scrape -> split -> tokenize -> embed -> write, each stage in its own thread(s)
+    connected by bounded queues, so memory use stays flat regardless of corpus size.
+    Returns the per-stage statistics. Raises the first error any stage hit.
+    """
+    stopEvent = threading.Event()
+    errors = []
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(5)]
+    stages = [
+        (StageStats("read"), lambda items: items, links, queues[0], 1),
+        (StageStats("scrape"), scrapeStage, lambda: iterQueue(queues[0], stopEvent), queues[1], scrape_workers),
+        (StageStats("split"), splitStage, lambda: iterQueue(queues[1], stopEvent), queues[2], 1),
+        (StageStats("tokenize"), tokenizeStage, lambda: iterQueue(queues[2], stopEvent), queues[3], 1),
+        (StageStats("embed"), embedStage, lambda: iterQueue(queues[3], stopEvent), queues[4], embed_workers),
+        (StageStats("write"), lambda rows: writeStage(rows, articles_csv, embeddings_csv),
+         lambda: iterQueue(queues[4], stopEvent), None, 1),
+    ]
+
+    threads = []
+    for stats, func, source, outQueue, workers in stages:
+        threads += startStage(stats, func, source, outQueue, stopEvent, errors, workers)
+
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        name, error = errors[0]
+        raise RuntimeError(f"Pipeline stage '{name}' failed: {error}") from error
+
+    return [stats for stats, *_ in stages]
+
+def main():
+
+    start_time = time.time()
+
+    # Setup command line arguments
+    parser = argparse.ArgumentParser(description='Scrape, split and embed articles in a single streaming pass.')
+    parser.add_argument('-i', '--input', required=True, help='Input CSV file with article links')
+    parser.add_argument('-o', '--output', required=True, help='Output CSV file for split paragraphs')
+    parser.add_argument('-q', '--queue-size', type=int, default=100, help='Maximum items waiting between stages')
+    parser.add_argument('--scrape-workers', type=int, default=1, help='Number of threads downloading articles')
+    parser.add_argument('--embed-workers', type=int, default=4, help='Number of threads requesting embeddings')
+    args = parser.parse_args()
+
+    # Embeddings are written next to the paragraphs, named like genericEmbedding.py's output
+    output_dir, output_name = os.path.split(args.output)
+    embeddings_csv = os.path.join(output_dir, f"embeddings_{output_name}")
+
+    stats = runPipeline(readLinks(args.input), args.output, embeddings_csv,
+                        args.queue_size, args.scrape_workers, args.embed_workers)
+
+    print(f"Saved {args.output}")
+    print(f"Saved {embeddings_csv}")
+
+    # Report per-stage throughput
+    print("\nStage throughput:")
+    for stage in stats:
+        print(stage.report())
+
+    # End timer and print runtime
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    print(f"\nTotal runtime: {elapsed_time:.2f} seconds")
+
+
+if __name__ == '__main__':
+    main()
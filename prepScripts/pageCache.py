@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+
+class PageCache:
+    """
+    A persistent cache of raw article HTML, keyed by URL.
+
+    For each URL the cache keeps the page's ETag and Last-Modified headers and a hash of
+    its body. Re-fetching sends these back as conditional request headers, so publishers
+    that support them can answer 304 Not Modified instead of sending the whole page.
+
+    A page only counts as unchanged once it has been committed, i.e. once the caller has
+    written it to its output. Until then it is returned again on the next run, even if the
+    publisher answers 304, so the index can be saved at any point without losing changes.
+
+    The cache lives in a directory holding an index.json file and one .html file per page.
+    """
+    def __init__(self, directory, user_agent="newspaper/0.2.8", timeout=7):
+        self.directory = directory
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.index_path = os.path.join(directory, "index.json")
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+        else:
+            self.index = {}
+
+    def page_path(self, url):
+        """
+        Returns the path of the cached HTML file for a URL.
+        """
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".html")
+
+    def fetch(self, url):
+        """
+        Fetch a page, sending conditional headers if a cached copy exists.
+        Returns the page HTML if it is new or has changed since it was last committed,
+        or None if it is unchanged. Raises urllib.error.URLError (including HTTPError
+        for error statuses) or OSError if the page cannot be fetched.
+        """
+        entry = self.index.get(url, {})
+        cached = os.path.exists(self.page_path(url))
+        headers = {"User-Agent": self.user_agent}
+        if cached and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if cached and entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=self.timeout) as response:
+                body = response.read()
+                responseHeaders = response.headers
+                charset = response.headers.get_content_charset() or "utf-8"
+        except urllib.error.HTTPError as e:
+            # 304 Not Modified: the cached copy is still current
+            if e.code == 304 and cached:
+                return self._changed(url)
+            raise
+
+        contentHash = hashlib.sha256(body).hexdigest()
+        html = body.decode(charset, errors="replace")
+        if contentHash != entry.get("hash") or not cached:
+            with open(self.page_path(url), "w", encoding="utf-8") as f:
+                f.write(html)
+
+        # Keep the newest validators even when the body is unchanged
+        self.index[url] = dict(entry, etag=responseHeaders.get("ETag"),
+                               lastModified=responseHeaders.get("Last-Modified"), hash=contentHash)
+        return self._changed(url)
+
+    def _changed(self, url):
+        # Return the cached HTML unless this version has already been committed
+        entry = self.index[url]
+        if entry.get("committedHash") == entry["hash"]:
+            return None
+        with open(self.page_path(url), encoding="utf-8") as f:
+            return f.read()
+
+    def commit(self, urls):
+        """
+        Mark the current version of each URL as output, so it is unchanged on the next run.
+        """
+        for url in urls:
+            self.index[url]["committedHash"] = self.index[url]["hash"]
+
+    def save(self):
+        """
+        Write the cache index to disk.
+        """
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,90 @@
+import sys
+import pytest
+from conftest import FakeTokenizer
+
+class FakeArticle:
+    """
+    Stands in for newspaper's Article: the page HTML is used as the article text as is.
+    """
+    def __init__(self, link):
+        self.link = link
+        self.html = None
+
+    def download(self, input_html=None):
+        self.html = input_html
+
+    def parse(self):
+        self.title = self.link.rsplit("/", 1)[-1]
+        self.text = self.html
+
+@pytest.fixture
+def gather(importWithStubs, server):
+    pytest.importorskip("pandas")
+    server.pages = {
+        "/etag/a": "First paragraph of article a is here\nSecond paragraph of article a is here",
+        "/plain/b": "First paragraph of article b is here\nSecond paragraph of article b is here",
+    }
+    return importWithStubs("genericDataGather", {
+        "transformers": {"GPT2TokenizerFast": FakeTokenizer},
+        "newspaper": {"Article": FakeArticle},
+    })
+
+def runMain(gather, monkeypatch, links, output, cache):
+    import pandas as pd
+    output.parent.mkdir(exist_ok=True)
+    inputPath = output.parent / "links.csv"
+    inputPath.write_text("\n".join(links) + "\n")
+    monkeypatch.setattr(sys, "argv", ["genericDataGather.py", "-i", str(inputPath), "-o", str(output), "-c", str(cache)])
+    gather.main()
+    return pd.read_csv(output, index_col="uniqueId")
+
+def test_rerun_outputs_only_changed_articles_with_stable_ids(gather, server, monkeypatch, tmp_path):
+    links = [server.url + "/etag/a", server.url + "/plain/b", server.url + "/missing", server.url + "/etag/a"]
+    output = tmp_path / "out" / "changedArticles.csv"
+    cache = tmp_path / "cache"
+
+    # First run: the missing page is skipped and the duplicate link is only scraped once
+    first = runMain(gather, monkeypatch, links, output, cache)
+    assert sorted(first["articleLink"].unique()) == sorted(links[:2])
+    assert len(first) == 4
+    firstIds = first[first["articleLink"] == links[1]].index.tolist()
+    assert [uniqueId.rsplit("-", 1)[1] for uniqueId in firstIds] == ["0", "1"]
+
+    # Second run: only b changed, and its paragraphs keep their IDs
+    server.pages["/plain/b"] = "First paragraph of article b is here\nSecond paragraph of article b was updated"
+    second = runMain(gather, monkeypatch, links, output, cache)
+    assert second["articleLink"].unique().tolist() == [links[1]]
+    assert second.index.tolist() == firstIds
+    assert second.loc[firstIds[1], "articleText"].endswith("was updated")
+
+    # Third run: nothing changed, so the previous output is replaced by an empty one
+    third = runMain(gather, monkeypatch, links, output, cache)
+    assert third.empty
+
+def test_articles_are_output_again_if_writing_fails(gather, server, monkeypatch, tmp_path):
+    links = [server.url + "/etag/a"]
+    cache = tmp_path / "cache"
+
+    def failingToCsv(self, *args, **kwargs):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(gather.pd.DataFrame, "to_csv", failingToCsv)
+        with pytest.raises(OSError):
+            runMain(gather, patch, links, tmp_path / "out" / "articles.csv", cache)
+
+    # The index was saved, but the article was never committed, so it is output on the next run
+    assert (cache / "index.json").exists()
+    rerun = runMain(gather, monkeypatch, links, tmp_path / "out" / "articles.csv", cache)
+    assert len(rerun) == 2
+
+def test_index_is_saved_every_50_pages(gather, server, monkeypatch, tmp_path):
+    cache = gather.PageCache(str(tmp_path / "cache"))
+    saves = []
+    monkeypatch.setattr(cache, "save", lambda: saves.append(len(cache.index)))
+
+    links = [server.url + f"/missing/{i}" for i in range(110)] + [server.url + "/etag/a"]
+    articles = gather.scrapeArticleText(links, cache)
+
+    assert articles["articleLink"].tolist() == [server.url + "/etag/a"]
+    assert len(saves) == 2
@@ -0,0 +1,83 @@
+import importlib.util
+import threading
+import time
+import pytest
+from conftest import FakeTokenizer
+
+class FakeArticle:
+    def __init__(self, link):
+        self.link = link
+
+    def download(self):
+        pass
+
+    def parse(self):
+        self.title = f"Title {self.link}"
+        self.text = "First paragraph of the article\n\nSecond paragraph of the article"
+
+@pytest.fixture
+def pipeline(importWithStubs):
+    """
+    Import the pipeline without the scraping, tokenizer and OpenAI packages, so nothing is
+    downloaded. The embedding call is replaced in each test.
+    """
+    stubs = {
+        "openai": {"OpenAI": lambda **kwargs: None},
+        "transformers": {"GPT2TokenizerFast": FakeTokenizer},
+        "newspaper": {"Article": FakeArticle},
+        "newspaper.article": {"ArticleException": Exception},
+    }
+    # pandas is only needed by the scripts the pipeline imports from, not the pipeline itself
+    if importlib.util.find_spec("pandas") is None:
+        stubs["pandas"] = {"DataFrame": object}
+    return importWithStubs("genericPipeline", stubs)
+
+def test_pipeline_writes_every_paragraph(pipeline, monkeypatch, tmp_path):
+    monkeypatch.setattr(pipeline, "get_embedding", lambda text: [0.1, 0.2, 0.3])
+    articles_csv = tmp_path / "articles.csv"
+    embeddings_csv = tmp_path / "embeddings_articles.csv"
+
+    stats = pipeline.runPipeline((f"link{i}" for i in range(20)), str(articles_csv), str(embeddings_csv),
+                                 queue_size=2, scrape_workers=2, embed_workers=3)
+
+    assert {stage.name: stage.items for stage in stats}["write"] == 40
+    assert len(articles_csv.read_text().splitlines()) == 41
+    assert embeddings_csv.read_text().splitlines()[0] == "uniqueId,title,articleLink,0,1,2"
+
+def test_failed_worker_stops_the_pipeline(pipeline, monkeypatch, tmp_path):
+    calls = []
+    lock = threading.Lock()
+
+    def get_embedding(text):
+        with lock:
+            calls.append(text)
+            call = len(calls)
+        if call == 5:
+            raise OSError("embedding failed")
+        time.sleep(0.01)
+        return [0.1, 0.2, 0.3]
+
+    monkeypatch.setattr(pipeline, "get_embedding", get_embedding)
+
+    with pytest.raises(RuntimeError, match="embed"):
+        pipeline.runPipeline((f"link{i}" for i in range(2000)), str(tmp_path / "a.csv"), str(tmp_path / "b.csv"),
+                             embed_workers=4)
+
+    # The other embed workers finish at most the call they were making, and nothing upstream keeps going
+    assert len(calls) < 20
+
+def test_throughput_shows_the_slow_stage(pipeline, monkeypatch, tmp_path):
+    def get_embedding(text):
+        time.sleep(0.02)
+        return [0.1, 0.2, 0.3]
+
+    monkeypatch.setattr(pipeline, "get_embedding", get_embedding)
+    stats = pipeline.runPipeline((f"link{i}" for i in range(20)), str(tmp_path / "a.csv"), str(tmp_path / "b.csv"),
+                                 queue_size=2, embed_workers=1)
+    stats = {stage.name: stage for stage in stats}
+
+    # Once the queues fill, every stage runs for about as long as the embed stage,
+    # but only the embed stage spends that time busy
+    assert stats["embed"].busy >= 40 * 0.02 * 0.9
+    assert stats["split"].busy < stats["embed"].busy / 10
+    assert stats["split"].elapsed > stats["embed"].busy / 2
@@ -0,0 +1,51 @@
+import urllib.error
+import pytest
+from pageCache import PageCache
+
+def fetchAll(cache, base, paths):
+    return {path: cache.fetch(base + path) for path in paths}
+
+def test_first_fetch_returns_pages(server, tmp_path):
+    cache = PageCache(str(tmp_path))
+    assert fetchAll(cache, server.url, ["/etag/a", "/plain/b"]) == {"/etag/a": "<html>A1</html>", "/plain/b": "<html>B1</html>"}
+    assert server.requests == [("/etag/a", None), ("/plain/b", None)]
+
+def test_committed_pages_are_unchanged(server, tmp_path):
+    cache = PageCache(str(tmp_path))
+    fetchAll(cache, server.url, ["/etag/a", "/plain/b"])
+    cache.commit([server.url + "/etag/a", server.url + "/plain/b"])
+    cache.save()
+
+    # A fresh cache reads the saved index: /etag/a gets a 304, /plain/b the same body with a 200
+    cache = PageCache(str(tmp_path))
+    assert fetchAll(cache, server.url, ["/etag/a", "/plain/b"]) == {"/etag/a": None, "/plain/b": None}
+    assert server.requests[-2][1] is not None
+    assert server.requests[-1][1] is None
+
+def test_changed_pages_are_returned(server, tmp_path):
+    cache = PageCache(str(tmp_path))
+    fetchAll(cache, server.url, ["/etag/a", "/plain/b"])
+    cache.commit([server.url + "/etag/a", server.url + "/plain/b"])
+
+    server.pages["/etag/a"] = "<html>A2</html>"
+    server.pages["/plain/b"] = "<html>B2</html>"
+    assert fetchAll(cache, server.url, ["/etag/a", "/plain/b"]) == {"/etag/a": "<html>A2</html>", "/plain/b": "<html>B2</html>"}
+
+def test_uncommitted_pages_are_returned_again(server, tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.fetch(server.url + "/etag/a")
+    cache.save()
+
+    # The output was never written, so the page is still returned even though the server answers 304
+    cache = PageCache(str(tmp_path))
+    assert cache.fetch(server.url + "/etag/a") == "<html>A1</html>"
+    assert server.requests[-1][1] is not None
+
+def test_error_status_raises_and_keeps_index(server, tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.fetch(server.url + "/etag/a")
+    with pytest.raises(urllib.error.HTTPError):
+        cache.fetch(server.url + "/missing")
+    cache.save()
+
+    assert list(PageCache(str(tmp_path)).index) == [server.url + "/etag/a"]